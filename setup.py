@@ -7,7 +7,7 @@ setup(
     py_modules=["wd"],
     install_requires=[
         "requests",
-        "beautifulsoup4",
+        "lxml",
         "python-magic"
     ],
     entry_points={
@@ -11,17 +11,27 @@ to avoid rate-limiting.
 import argparse
 import sys
 import uuid
+from contextlib import contextmanager
 import datetime
+import hashlib
+import io
+import json
 import logging
+import os
 import time
 import random
+import shutil
+import sqlite3
+import threading
 from pathlib import Path
 from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+import urllib3
 import magic  # python-magic
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 # Supported extensions → MIME
 ALL_EXTENSIONS = {
@@ -35,9 +45,50 @@ ALL_EXTENSIONS = {
     '.txt':     'text/plain',
 }
 
-# Pause between search requests (seconds)
+# ext → (full MIME, major type) and MIME → extensions in preference order
+ALL_EXT_INFO = {ext: (mime, mime.split('/', 1)[0]) for ext, mime in ALL_EXTENSIONS.items()}
+MIME_TO_EXTS = {}
+for _ext, _mime in ALL_EXTENSIONS.items():
+    MIME_TO_EXTS[_mime] = MIME_TO_EXTS.get(_mime, ()) + (_ext,)
+
+# Pause between search requests to the same engine (seconds)
 SEARCH_PAUSE = 2
 
+# Concurrent requests allowed to any other single host
+HOST_CONCURRENCY = 4
+
+# Shared libmagic handle; sniffing uses the first MIME_PEEK bytes of a download
+MIME = magic.Magic(mime=True)
+MIME_PEEK = 4096
+# Containers that need the whole file to classify: DOCX is a zip, legacy
+# DOC an OLE/CDF compound file
+AMBIGUOUS_MIMES = {'application/octet-stream', 'binary/octet-stream', 'application/zip',
+                   'application/x-ole-storage', 'application/CDFV2'}
+# libmagic's answers for a zero-length buffer or file
+EMPTY_MIMES = {'application/x-empty', 'inode/x-empty'}
+
+# Largest Content-Length (bytes) accepted by the HEAD probe
+MAX_SIZE = 200 * 1024 * 1024
+
+# Per-output-directory record of downloads, used for conditional GETs
+INDEX_NAME = ".wd_cache.sqlite"
+
+# Threads for post-download MIME checks and renames
+POST_WORKERS = 2
+
+# Chunk/buffer size for streaming downloads to disk
+COPY_CHUNK = 1024 * 1024
+
+# Retry backoff bounds (seconds) for decorrelated jitter
+RETRY_BASE = 0.1
+RETRY_CAP = 30
+# Download hosts are not paced by SEARCH_PAUSE, so back off from them more gently
+DOWNLOAD_RETRY_BASE = 1
+
+# On-disk search result cache and its time-to-live (seconds)
+CACHE_DIR = Path.home() / ".cache" / "wd"
+CACHE_TTL = 3600
+
 # A small pool of realistic User-Agents
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -48,6 +99,9 @@ USER_AGENTS = [
     "(KHTML, like Gecko) Chrome/114.0 Safari/537.36",
 ]
 
+# Shared session so searches and downloads reuse keep-alive connections
+SESSION = requests.Session()
+
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
 
@@ -55,42 +109,139 @@ def random_headers():
     return {'User-Agent': random.choice(USER_AGENTS)}
 
 
+def configure_session(pool_maxsize: int):
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=0)
+    SESSION.mount('http://', adapter)
+    SESSION.mount('https://', adapter)
+
+
+class HostLimiter:
+    # Per-host cap on concurrent requests plus a minimum gap between request starts
+    def __init__(self, concurrency: int, interval: float = 0.0, overrides=None):
+        self._default = (concurrency, interval)
+        self._overrides = overrides or {}
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                concurrency, interval = self._overrides.get(host, self._default)
+                state = {'sem': threading.Semaphore(concurrency), 'interval': interval,
+                         'next': 0.0, 'lock': threading.Lock()}
+                self._hosts[host] = state
+            return state
+
+    @contextmanager
+    def slot(self, url: str, cancel=None):
+        # Yields False instead of pacing when the `cancel` event is set while
+        # waiting, so queued requests that are no longer needed are never sent
+        state = self._state(urlparse(url).hostname or '')
+        with state['sem']:
+            if cancel is not None and cancel.is_set():
+                yield False
+                return
+            if state['interval']:
+                with state['lock']:
+                    now = time.monotonic()
+                    previous = state['next']
+                    start = max(now, previous)
+                    state['next'] = start + state['interval']
+                if cancel is None:
+                    time.sleep(start - now)
+                elif cancel.wait(start - now):
+                    # hand the unused start time back unless someone queued behind it
+                    with state['lock']:
+                        if state['next'] == start + state['interval']:
+                            state['next'] = previous
+                    yield False
+                    return
+            yield True
+
+
+def _retry_after(exc):
+    resp = getattr(exc, 'response', None)
+    if resp is None:
+        return None
+    try:
+        return max(0.0, min(RETRY_CAP, float(resp.headers.get('Retry-After'))))
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry(fn, attempts, base=RETRY_BASE, cap=RETRY_CAP, label='',
+           retry_on=(requests.RequestException, OSError)):
+    # Decorrelated jitter (or the server's Retry-After); re-raises the last error
+    delay = base
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except retry_on as e:
+            logging.warning(f"{label} attempt {attempt}/{attempts} failed: {e}")
+            if attempt == attempts:
+                raise
+            delay = min(cap, random.uniform(base, delay * 3))
+            retry_after = _retry_after(e)
+            time.sleep(delay if retry_after is None else retry_after)
+
+
+def _has_class(el, cls: str) -> bool:
+    return cls in (el.get('class') or '').split()
+
+
 class SearchEngine:
-    def search(self, query: str, max_results: int):
+    def search(self, query: str, max_results: int, cancel=None):
         raise NotImplementedError
 
-    def _get_with_retry(self, url, params, max_attempts=3):
-        delay = 1
-        for attempt in range(1, max_attempts + 1):
-            try:
-                resp = requests.get(url, params=params, headers=random_headers(), timeout=15)
-                # If being rate-limited, status code 429
-                if resp.status_code == 429:
-                    raise requests.HTTPError("429 Rate Limited")
-                resp.raise_for_status()
-                return resp
-            except requests.HTTPError as e:
-                logging.warning(f"Search HTTP error (attempt {attempt}): {e}")
-            except requests.RequestException as e:
-                logging.warning(f"Search request failed (attempt {attempt}): {e}")
-            if attempt < max_attempts:
-                time.sleep(delay)
-                delay *= 2
-        logging.error(f"Failed to GET {url} after {max_attempts} attempts")
-        return None
+    @staticmethod
+    def _iter_links(resp):
+        # Yields <a href> elements as soon as each one is parsed and frees it
+        # afterwards, so callers can stop at max_results without a full DOM.
+        try:
+            for _, a in etree.iterparse(io.BytesIO(resp.content), events=('end',),
+                                        tag='a', html=True, recover=True):
+                if a.get('href'):
+                    yield a
+                parent = a.getparent()
+                a.clear()
+                if parent is not None:
+                    parent.remove(a)
+        except etree.LxmlError as e:
+            logging.warning(f"Could not parse search results from {resp.url}: {e}")
+
+    def _get_with_retry(self, url, params, max_attempts=3, cancel=None):
+        def get():
+            with HOST_LIMITER.slot(url, cancel) as allowed:
+                if not allowed:
+                    return None
+                logging.info(f"Searching {urlparse(url).hostname}: {params['q']!r}")
+                resp = SESSION.get(url, params=params, headers=random_headers(), timeout=15)
+            # If being rate-limited, status code 429
+            if resp.status_code == 429:
+                raise requests.HTTPError("429 Rate Limited", response=resp)
+            resp.raise_for_status()
+            return resp
+        try:
+            return _retry(get, max_attempts, label=f"Search GET {url}",
+                          retry_on=(requests.RequestException,))
+        except requests.RequestException:
+            logging.error(f"Failed to GET {url} after {max_attempts} attempts")
+            return None
 
 
 class DuckDuckGoEngine(SearchEngine):
     BASE = "https://html.duckduckgo.com/html/"
 
-    def search(self, query: str, max_results: int):
-        resp = self._get_with_retry(self.BASE, {'q': query})
+    def search(self, query: str, max_results: int, cancel=None):
+        resp = self._get_with_retry(self.BASE, {'q': query}, cancel=cancel)
         if not resp:
             return []
-        soup = BeautifulSoup(resp.text, 'html.parser')
         results = []
-        for a in soup.select('a.result__a[href]'):
-            href = a['href']
+        for a in self._iter_links(resp):
+            if not _has_class(a, 'result__a'):
+                continue
+            href = a.get('href')
             if href.startswith('/l/?'):
                 for part in href[3:].split('&'):
                     if part.startswith('uddg='):
@@ -105,27 +256,49 @@ class DuckDuckGoEngine(SearchEngine):
 class BingEngine(SearchEngine):
     BASE = "https://www.bing.com/search"
 
-    def search(self, query: str, max_results: int):
-        resp = self._get_with_retry(self.BASE, {'q': query})
+    @staticmethod
+    def _is_result(a) -> bool:
+        # CSS: li.b_algo h2 a
+        in_h2 = False
+        for anc in a.iterancestors():
+            if anc.tag == 'h2':
+                in_h2 = True
+            elif in_h2 and anc.tag == 'li' and _has_class(anc, 'b_algo'):
+                return True
+        return False
+
+    def search(self, query: str, max_results: int, cancel=None):
+        resp = self._get_with_retry(self.BASE, {'q': query}, cancel=cancel)
         if not resp:
             return []
-        soup = BeautifulSoup(resp.text, 'html.parser')
-        return [a['href'] for a in soup.select('li.b_algo h2 a[href]')][:max_results]
+        results = []
+        for a in self._iter_links(resp):
+            if self._is_result(a):
+                results.append(a.get('href'))
+                if len(results) >= max_results:
+                    break
+        return results
 
 
 class GoogleEngine(SearchEngine):
     BASE = "https://www.google.com/search"
 
-    def search(self, query: str, max_results: int):
-        resp = self._get_with_retry(self.BASE, {'q': query, 'num': max_results})
+    def search(self, query: str, max_results: int, cancel=None):
+        resp = self._get_with_retry(self.BASE, {'q': query, 'num': max_results},
+                                    cancel=cancel)
         if not resp:
             return []
-        soup = BeautifulSoup(resp.text, 'html.parser')
         links = []
-        for g in soup.select('div.g'):
-            a = g.find('a', href=True)
-            if a and not a['href'].startswith('/'):
-                links.append(a['href'])
+        seen_blocks = set()
+        for a in self._iter_links(resp):
+            # only the first link inside each div.g result block counts
+            block = next((d for d in a.iterancestors('div') if _has_class(d, 'g')), None)
+            if block is None or block in seen_blocks:
+                continue
+            seen_blocks.add(block)
+            href = a.get('href')
+            if not href.startswith('/'):
+                links.append(href)
             if len(links) >= max_results:
                 break
         return links
@@ -137,10 +310,125 @@ ENGINES = {
     'google':     GoogleEngine(),
 }
 
+# Engines get one request per SEARCH_PAUSE; other hosts HOST_CONCURRENCY at a time
+HOST_LIMITER = HostLimiter(HOST_CONCURRENCY, overrides={
+    urlparse(engine.BASE).hostname: (1, SEARCH_PAUSE) for engine in ENGINES.values()
+})
+
+
+class SearchCache:
+    # Memory layer in front of one JSON-lines file per (engine, query) key
+    def __init__(self, directory: Path, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+        self.enabled = True
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(engine: str, query: str, max_results: int) -> str:
+        return hashlib.sha256(f"{engine}:{max_results}:{query}".encode()).hexdigest()
+
+    def get(self, engine: str, query: str, max_results: int):
+        if not self.enabled:
+            return None
+        key = self._key(engine, query, max_results)
+        with self._lock:
+            entry = self._memory.get(key)
+        if entry is None:
+            path = self.directory / f"{key}.jsonl"
+            try:
+                stamp = path.stat().st_mtime
+                with open(path, encoding='utf-8') as f:
+                    entry = (stamp, [json.loads(line) for line in f if line.strip()])
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._memory[key] = entry
+        stamp, results = entry
+        if time.time() - stamp > self.ttl:
+            return None
+        return results
+
+    def put(self, engine: str, query: str, max_results: int, results):
+        if not self.enabled:
+            return
+        key = self._key(engine, query, max_results)
+        with self._lock:
+            self._memory[key] = (time.time(), list(results))
+        path = self.directory / f"{key}.jsonl"
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for u in results:
+                    f.write(json.dumps(u) + "\n")
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Could not write search cache {path}: {e}")
+            tmp.unlink(missing_ok=True)
+
+
+SEARCH_CACHE = SearchCache(CACHE_DIR, CACHE_TTL)
+
+
+def cached_search(name: str, query: str, max_results: int, cancel=None):
+    cached = SEARCH_CACHE.get(name, query, max_results)
+    if cached is not None:
+        logging.info(f"Search cache hit for {name}: {query!r}")
+        return cached
+    results = ENGINES[name].search(query, max_results=max_results, cancel=cancel)
+    # empty pages are usually blocks or rate limits, so only cache hits
+    if results:
+        SEARCH_CACHE.put(name, query, max_results, results)
+    return results
+
+
+def search_with(name: str, ext: str, query: str, max_results: int, done: threading.Event):
+    # `done` is set once any engine has answered this extension (or --max is
+    # reached); searches still waiting for their engine then return [] unsent
+    if done.is_set():
+        return []
+    results = cached_search(name, query, max_results, cancel=done)
+    if results:
+        done.set()
+    return results
+
+
+def first_results(ext: str, futures):
+    # futures are one engine search each, in preference order; returns the
+    # first non-empty result (earlier engines win ties) and cancels the rest
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for f in futures:
+            if f not in done or f.cancelled():
+                continue
+            try:
+                results = f.result()
+            except Exception as e:
+                logging.warning(f"[{ext}] search failed: {e}")
+                continue
+            if results:
+                for other in pending:
+                    other.cancel()
+                return [u for u in results if u.lower().endswith(ext)]
+    return []
+
+
+class _FilenameTable(dict):
+    # str.translate table: keeps alphanumerics and ' ._-', filled per code point on first use
+    def __missing__(self, code):
+        c = chr(code)
+        self[code] = keep = code if c.isalnum() or c in ' ._-' else None
+        return keep
+
+
+_FILENAME_TABLE = _FilenameTable()
+
 
 def sanitize_filename(name: str) -> str:
-    keep = (' ', '.', '_', '-')
-    return "".join(c for c in name if c.isalnum() or c in keep).rstrip()
+    return name.translate(_FILENAME_TABLE).rstrip()
 
 
 def parse_only(arg: str):
@@ -154,52 +442,237 @@ def parse_only(arg: str):
     return exts
 
 
-def download_file(url: str, dest: Path, allowed: dict) -> bool:
-    r = requests.get(url, stream=True, timeout=15, headers=random_headers())
-    r.raise_for_status()
-    tmp = dest.with_suffix(dest.suffix + '.part')
-    with open(tmp, 'wb') as f:
-        for chunk in r.iter_content(4096):
-            f.write(chunk)
-    mime = magic.from_file(str(tmp), mime=True)
+def resolve_dest(url: str, dest: Path, mime: str, allowed: dict):
+    # an empty body sniffs as application/x-empty, which would pass the major-type check
+    if mime in EMPTY_MIMES:
+        logging.info(f"Skipping {url}: empty response body")
+        return None
     ext = dest.suffix.lower()
     if ext in allowed:
-        if not mime.startswith(allowed[ext].split('/')[0]):
-            logging.info(f"Skipping {url}: MIME {mime} ≠ {allowed[ext]}")
-            tmp.unlink(missing_ok=True)
-            return False
-    else:
-        for e, m in allowed.items():
-            if mime == m:
-                dest = dest.with_suffix(e)
-                break
-        else:
-            logging.info(f"Skipping {url}: unsupported MIME {mime}")
+        full_mime, prefix = ALL_EXT_INFO[ext]
+        if not mime.startswith(prefix):
+            logging.info(f"Skipping {url}: MIME {mime} ≠ {full_mime}")
+            return None
+        return dest
+    for e in MIME_TO_EXTS.get(mime, ()):
+        if e in allowed:
+            return dest.with_suffix(e)
+    logging.info(f"Skipping {url}: unsupported MIME {mime}")
+    return None
+
+
+class DownloadIndex:
+    # url → (etag, last_modified, local_name) of files already in outdir
+    def __init__(self, path: Path):
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS downloads ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, local_name TEXT)"
+            )
+
+    def lookup(self, url: str):
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, local_name FROM downloads WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+    def record(self, url: str, etag, last_modified, local_name: str):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO downloads (url, etag, last_modified, local_name) "
+                "VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, local_name),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@contextmanager
+def _raw_stream_errors():
+    # Reading r.raw bypasses requests' exception mapping; restore what
+    # iter_content would raise so _retry still sees RequestExceptions
+    try:
+        yield
+    except urllib3.exceptions.ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e) from e
+    except urllib3.exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e) from e
+    except urllib3.exceptions.SSLError as e:
+        raise requests.exceptions.SSLError(e) from e
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.exceptions.ConnectionError(e) from e
+
+
+def download_file(url: str, dest: Path, allowed: dict, validators=None):
+    # Streams the body to a .part file and returns (tmp, dest, mime, etag,
+    # last_modified) for finalize_download, None if the content type is
+    # rejected, or True if the server answered 304 to `validators`.
+    tmp = dest.with_suffix(dest.suffix + '.part')
+    headers = {**random_headers(), **(validators or {})}
+    with HOST_LIMITER.slot(url), \
+         SESSION.get(url, stream=True, timeout=15, headers=headers) as r:
+        if r.status_code == 304:
+            logging.info(f"Unchanged: {url}")
+            return True
+        r.raise_for_status()
+        # let urllib3 undo gzip/deflate and copy in large chunks
+        r.raw.decode_content = True
+        # sniff the first bytes so wrong types are rejected before the body is fetched
+        with _raw_stream_errors():
+            head = r.raw.read(MIME_PEEK)
+        mime = MIME.from_buffer(head)
+        if mime not in AMBIGUOUS_MIMES:
+            dest = resolve_dest(url, dest, mime, allowed)
+            if dest is None:
+                return None
+        try:
+            with open(tmp, 'wb', buffering=COPY_CHUNK) as f, _raw_stream_errors():
+                f.write(head)
+                shutil.copyfileobj(r.raw, f, length=COPY_CHUNK)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            # don't leave a truncated .part behind for the next attempt or run
             tmp.unlink(missing_ok=True)
-            return False
-    tmp.rename(dest)
+            raise
+    return tmp, dest, mime, r.headers.get('ETag'), r.headers.get('Last-Modified')
+
+
+def finalize_download(url: str, tmp: Path, dest: Path, mime: str, etag, last_modified,
+                      allowed: dict, index=None) -> bool:
+    # Runs on the post-processing pool so HTTP workers are not held up by disk/CPU work
+    try:
+        if mime in AMBIGUOUS_MIMES:
+            mime = MIME.from_file(str(tmp))
+            dest = resolve_dest(url, dest, mime, allowed)
+            if dest is None:
+                tmp.unlink(missing_ok=True)
+                return False
+        os.replace(tmp, dest)
+    except OSError as e:
+        logging.error(f"[{url}] could not finalize {tmp.name}: {e}")
+        tmp.unlink(missing_ok=True)
+        return False
     logging.info(f"Saved: {dest.name} ({mime})")
+    if index is not None:
+        try:
+            index.record(url, etag, last_modified, dest.name)
+        except sqlite3.Error as e:
+            # the file is saved; it just won't be revalidated on the next run
+            logging.warning(f"[{url}] could not update {INDEX_NAME}: {e}")
     return True
 
 
-def download_with_retry(url: str, outdir: Path, allowed: dict, attempts: int = 3) -> bool:
+def probe(url: str, dest: Path, allowed: dict) -> bool:
+    # HEAD check before GET; False only when the server says the body is
+    # clearly the wrong type or too large. Errors and 403/405 defer to GET.
+    try:
+        with HOST_LIMITER.slot(url):
+            r = SESSION.head(url, allow_redirects=True, timeout=10, headers=random_headers())
+    except requests.RequestException:
+        return True
+    if r.status_code >= 400:
+        return True
+    ctype = r.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if ctype and ctype not in AMBIGUOUS_MIMES:
+        ext = dest.suffix.lower()
+        expected = [ext] if ext in allowed else allowed
+        if not any(ctype.startswith(ALL_EXT_INFO[e][1]) for e in expected):
+            logging.info(f"Skipping {url}: Content-Type {ctype}")
+            return False
+    size = r.headers.get('Content-Length', '')
+    if size.isdigit() and int(size) > MAX_SIZE:
+        logging.info(f"Skipping {url}: {int(size)} bytes exceeds {MAX_SIZE}")
+        return False
+    return True
+
+
+def download_with_retry(url: str, outdir: Path, allowed: dict, attempts: int = 3,
+                        index=None):
     name = sanitize_filename(Path(url).stem) or uuid.uuid4().hex
     ext = Path(urlparse(url).path).suffix.lower()
     dest = outdir / name
     if ext in allowed:
         dest = dest.with_suffix(ext)
-    delay = 1
-    for i in range(1, attempts + 1):
+    # revalidate files from an earlier run instead of fetching them again
+    validators = {}
+    entry = index.lookup(url) if index is not None else None
+    if entry and (outdir / entry[2]).exists():
+        etag, last_modified, _ = entry
+        if etag:
+            validators['If-None-Match'] = etag
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+    if not validators and not probe(url, dest, allowed):
+        return None
+    try:
+        return _retry(lambda: download_file(url, dest, allowed, validators), attempts,
+                      base=DOWNLOAD_RETRY_BASE, label=f"[{url}]")
+    except (requests.RequestException, OSError):
+        logging.error(f"[{url}] giving up.")
+        return None
+
+
+class BoundedExecutor:
+    # ThreadPoolExecutor whose submit() blocks once `bound` tasks are queued or running
+    def __init__(self, max_workers: int, bound: int):
+        self._exe = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(bound)
+
+    def submit(self, fn, *args, **kwargs):
+        self._slots.acquire()
         try:
-            return download_file(url, dest, allowed)
-        except (requests.RequestException, OSError) as e:
-            logging.warning(f"[{url}] attempt {i}/{attempts} failed: {e}")
-            if i < attempts:
-                time.sleep(delay)
-                delay *= 2
-            else:
-                logging.error(f"[{url}] giving up.")
-                return False
+            future = self._exe.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._exe.shutdown(wait=True)
+        return False
+
+
+def download_all(urls, outdir: Path, allowed: dict, workers: int, index=None) -> int:
+    # Workers share SESSION, whose pool is sized to the worker count, so
+    # concurrent downloads from one host reuse warm connections. Finished
+    # streams are handed to a small pool for MIME checks and renames.
+    finalizing = []
+    unchanged = []
+
+    def stage(future, url):
+        try:
+            staged = future.result()
+        except Exception as e:
+            logging.error(f"Download worker failed: {e}")
+            return
+        if staged is True:
+            unchanged.append(url)
+        elif staged:
+            finalizing.append(post.submit(finalize_download, url, *staged, allowed, index))
+
+    with ThreadPoolExecutor(max_workers=POST_WORKERS) as post:
+        with BoundedExecutor(max_workers=workers, bound=workers * 2) as exe:
+            for u in urls:
+                future = exe.submit(download_with_retry, u, outdir, allowed, index=index)
+                future.add_done_callback(lambda f, u=u: stage(f, u))
+        downloaded = len(unchanged)
+        for f in as_completed(finalizing):
+            try:
+                if f.result():
+                    downloaded += 1
+            except Exception as e:
+                logging.error(f"Finalize worker failed: {e}")
+    return downloaded
 
 
 def main():
@@ -219,9 +692,13 @@ def main():
     p.add_argument('-o','--only',       help='Comma list of extensions: pdf,docx,md,...')
     p.add_argument('-e','--engine',     choices=ENGINES, default='duckduckgo',
                    help='Primary search engine')
+    p.add_argument('--no-cache',        action='store_true',
+                   help=f'Bypass the search result cache in {CACHE_DIR}')
     args = p.parse_args()
 
     allowed = ALL_EXTENSIONS if not args.only else parse_only(args.only)
+    configure_session(pool_maxsize=args.workers * 2)
+    SEARCH_CACHE.enabled = not args.no_cache
 
     # prepare output dir
     if args.destination:
@@ -238,37 +715,43 @@ def main():
     ordered = [primary] + [e for e in ENGINES if e != primary]
     doc_urls = []
 
-    for ext in allowed:
-        if len(doc_urls) >= args.max:
-            break
-        suffix = ext.lstrip('.')
-        query = f"{args.subject} filetype:{suffix}"
-        for name in ordered:
-            engine = ENGINES[name]
-            logging.info(f"[{ext}] searching with {name}: {query!r}")
-            results = engine.search(query, max_results=args.max)
-            if results:
-                for u in results:
-                    if u.lower().endswith(ext) and u not in doc_urls:
-                        doc_urls.append(u)
-                        if len(doc_urls) >= args.max:
-                            break
-                break
-            # pause before trying next engine
-            time.sleep(SEARCH_PAUSE)
+    queries = [(ext, f"{args.subject} filetype:{ext.lstrip('.')}") for ext in allowed]
+    # race all engines per extension; HOST_LIMITER still paces each engine
+    done = {ext: threading.Event() for ext, _ in queries}
+    with ThreadPoolExecutor(max_workers=min(8, len(queries) * len(ordered))) as exe:
+        racing = [(ext, [exe.submit(search_with, name, ext, query, args.max, done[ext])
+                         for name in ordered])
+                  for ext, query in queries]
+        # collect in extension order so results stay deterministic
+        for ext, futures in racing:
+            if len(doc_urls) >= args.max:
+                done[ext].set()
+                for f in futures:
+                    f.cancel()
+                continue
+            for u in first_results(ext, futures):
+                if len(doc_urls) >= args.max:
+                    break
+                if u not in doc_urls:
+                    doc_urls.append(u)
 
     if not doc_urls:
         logging.error("No document URLs found via any engine.")
         sys.exit(1)
 
     # download concurrently
-    downloaded = 0
-    with ThreadPoolExecutor(max_workers=args.workers) as exe:
-        futures = [exe.submit(download_with_retry, u, outdir, allowed) for u in doc_urls]
-        for f in as_completed(futures):
-            if f.result():
-                downloaded += 1
-
+    # the default output dir is new on every run, so only -d can reuse an index
+    index = None
+    if args.destination:
+        try:
+            index = DownloadIndex(outdir / INDEX_NAME)
+        except sqlite3.Error as e:
+            logging.warning(f"Could not open {outdir / INDEX_NAME}, not revalidating: {e}")
+    try:
+        downloaded = download_all(doc_urls, outdir, allowed, args.workers, index)
+    finally:
+        if index is not None:
+            index.close()
     logging.info(f"Done: {downloaded}/{len(doc_urls)} file(s) downloaded.")
 
 